@@ -1,5 +1,6 @@
 import logging
 import hashlib
+import asyncio
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.helpers import entity_registry as er
 from .const import DOMAIN
@@ -8,20 +9,33 @@ from .portainer_api import PortainerAPI
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.info("Loaded Portainer binary sensor integration.")
 
+# Single-pass replacement tables for identifier sanitization
+_ID_SANITIZE = str.maketrans({'-': '_', ' ': '_', '/': '_'})
+_NEEDS_SANITIZE = frozenset("- /")
+_HOST_SANITIZE = str.maketrans({'.': '_', ':': '_'})
+
+# Default Portainer/HTTP(S) ports that are left out of the displayed host name
+_DEFAULT_PORTS = frozenset(("9000", "9443", "80", "443"))
+
 def _get_host_display_name(base_url):
     """Extract a clean host name from the base URL for display purposes."""
     # Remove protocol and common ports
-    host = base_url.replace("https://", "").replace("http://", "")
+    if base_url.startswith("https://"):
+        host = base_url[8:]
+    elif base_url.startswith("http://"):
+        host = base_url[7:]
+    else:
+        host = base_url
     # Remove trailing slash if present
     host = host.rstrip("/")
     # Remove common ports
-    for port in [":9000", ":9443", ":80", ":443"]:
-        if host.endswith(port):
-            host = host[:-len(port)]
+    head, sep, port = host.rpartition(":")
+    if sep and port in _DEFAULT_PORTS:
+        host = head
     
     # If the host is an IP address, keep it as is
     # If it's a domain, try to extract a meaningful name
-    if host.replace('.', '').replace('-', '').replace('_', '').isdigit():
+    if not host.strip("0123456789.-_"):
         # It's an IP address, keep as is
         return host
     else:
@@ -44,9 +58,21 @@ def _build_stable_unique_id(entry_id, endpoint_id, container_name, stack_info, s
         base = f"{stack_name}_{service_name}"
     else:
         base = container_name
-    sanitized = base.replace('-', '_').replace(' ', '_').replace('/', '_')
+    # Most container names need no sanitizing, skip building a copy for them
+    sanitized = base if _NEEDS_SANITIZE.isdisjoint(base) else base.translate(_ID_SANITIZE)
     return f"entry_{entry_id}_endpoint_{endpoint_id}_{sanitized}_{suffix}"
 
+def _migrate_unique_id(er_registry, registered, old_uid, new_uid):
+    """Move a registry entry from its old container-ID based unique_id to the stable one."""
+    ent_id = registered.get(old_uid)
+    if not ent_id or old_uid == new_uid:
+        return
+    try:
+        er_registry.async_update_entity(ent_id, new_unique_id=new_uid)
+        _LOGGER.debug("Migrated %s unique_id: %s -> %s", ent_id, old_uid, new_uid)
+    except Exception as e:
+        _LOGGER.debug("Could not migrate %s: %s", ent_id, e)
+
 async def async_setup_entry(hass, entry, async_add_entities):
     config = entry.data
     host = config["host"]
@@ -60,40 +86,46 @@ async def async_setup_entry(hass, entry, async_add_entities):
     await api.initialize()
     containers = await api.get_containers(endpoint_id)
 
-    # Migrate old unique_ids to stable unique_ids
+    # Existing binary_sensor entities of this entry, keyed by unique_id, so old
+    # container-ID based unique_ids can be migrated without extra lookups
     try:
         er_registry = er.async_get(hass)
-        for container in containers:
-            name = container.get("Names", ["unknown"])[0].strip("/")
-            container_id = container["Id"]
-            container_info = await api.inspect_container(endpoint_id, container_id)
-            stack_info = api.get_container_stack_info(container_info) if container_info else {"is_stack_container": False}
-            old_uid = f"entry_{entry_id}_endpoint_{endpoint_id}_{container_id}_update_available"
-            new_uid = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "update_available")
-            if old_uid != new_uid:
-                ent_id = er_registry.async_get_entity_id("binary_sensor", DOMAIN, old_uid)
-                if ent_id:
-                    try:
-                        er_registry.async_update_entity(ent_id, new_unique_id=new_uid)
-                        _LOGGER.debug("Migrated %s unique_id: %s -> %s", ent_id, old_uid, new_uid)
-                    except Exception as e:
-                        _LOGGER.debug("Could not migrate %s: %s", ent_id, e)
+        registered = {
+            reg_entry.unique_id: reg_entry.entity_id
+            for reg_entry in er.async_entries_for_config_entry(er_registry, entry_id)
+            if reg_entry.domain == "binary_sensor"
+        }
     except Exception as e:
         _LOGGER.debug("Binary sensor registry migration skipped/failed: %s", e)
+        er_registry, registered = None, {}
+
+    # Inspect all containers concurrently (bounded, like the coordinator's
+    # stats polling) instead of paying one round trip per container in series
+    sem = asyncio.Semaphore(4)
+
+    async def inspect(container_id):
+        async with sem:
+            return await api.inspect_container(endpoint_id, container_id)
+
+    container_infos = await asyncio.gather(*(inspect(container["Id"]) for container in containers))
 
     entities = []
-    for container in containers:
+    for container, container_info in zip(containers, container_infos):
         name = container.get("Names", ["unknown"])[0].strip("/")
         container_id = container["Id"]
         
-        # Get container inspection data to determine if it's part of a stack
-        container_info = await api.inspect_container(endpoint_id, container_id)
+        # Container inspection data determines if it's part of a stack
         stack_info = api.get_container_stack_info(container_info) if container_info else {"is_stack_container": False}
         
+        if registered:
+            old_uid = f"entry_{entry_id}_endpoint_{endpoint_id}_{container_id}_update_available"
+            new_uid = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "update_available")
+            _migrate_unique_id(er_registry, registered, old_uid, new_uid)
+        
         # Create binary sensors for all containers - they will all belong to the same stack device if they're in a stack
         entities.append(ContainerUpdateAvailableSensor(name, api, endpoint_id, container_id, stack_info, entry_id))
 
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
 
 
 class ContainerUpdateAvailableSensor(BinarySensorEntity):
@@ -110,44 +142,6 @@ class ContainerUpdateAvailableSensor(BinarySensorEntity):
         self._attr_unique_id = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "update_available")
         self._attr_is_on = False
 
-    async def _find_current_container_id(self):
-        try:
-            containers = await self._api.get_containers(self._endpoint_id)
-            if not containers:
-                return None
-            if self._stack_info.get("is_stack_container"):
-                expected_stack = self._stack_info.get("stack_name")
-                expected_service = self._stack_info.get("service_name")
-                for container in containers:
-                    labels = container.get("Labels", {}) or {}
-                    if (
-                        labels.get("com.docker.compose.project") == expected_stack
-                        and labels.get("com.docker.compose.service") == expected_service
-                    ):
-                        return container.get("Id")
-            for container in containers:
-                names = container.get("Names", []) or []
-                if not names:
-                    continue
-                name = names[0].strip("/")
-                if name == self._container_name:
-                    return container.get("Id")
-        except Exception:
-            return None
-        return None
-
-    async def _ensure_container_bound(self) -> None:
-        try:
-            info = await self._api.get_container_info(self._endpoint_id, self._container_id)
-            if not info or not isinstance(info, dict) or not info.get("Id"):
-                new_id = await self._find_current_container_id()
-                if new_id and new_id != self._container_id:
-                    self._container_id = new_id
-        except Exception:
-            new_id = await self._find_current_container_id()
-            if new_id and new_id != self._container_id:
-                self._container_id = new_id
-
     @property
     def icon(self):
         return "mdi:update" if self._attr_is_on else "mdi:update-disabled"
@@ -161,7 +155,7 @@ class ContainerUpdateAvailableSensor(BinarySensorEntity):
             # For stack containers, use the stack as the device
             stack_name = self._stack_info.get("stack_name", "unknown_stack")
             # Use a more robust identifier that includes the entry_id, host hash, and host name to prevent duplicates
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"Stack: {stack_name} ({host_name})",
@@ -171,7 +165,7 @@ class ContainerUpdateAvailableSensor(BinarySensorEntity):
             }
         else:
             # For standalone containers, use the container as the device
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"{self._container_name} ({host_name})",
@@ -182,8 +176,9 @@ class ContainerUpdateAvailableSensor(BinarySensorEntity):
 
     async def async_update(self):
         """Update the update availability status."""
+        # No per-poll rebind: check_image_updates is disabled (constant False) and
+        # makes no API call, so a stale container ID cannot cause a failed request
         try:
-            await self._ensure_container_bound()
             has_update = await self._api.check_image_updates(self._endpoint_id, self._container_id)
             self._attr_is_on = has_update
         except Exception as e:
@@ -12,6 +12,11 @@ from .portainer_api import PortainerAPI
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.info("Loaded Portainer button integration.")
 
+# Single-pass replacement tables for identifier sanitization
+_ID_SANITIZE = str.maketrans({'-': '_', ' ': '_', '/': '_'})
+_NEEDS_SANITIZE = frozenset("- /")
+_HOST_SANITIZE = str.maketrans({'.': '_', ':': '_'})
+
 def _build_stable_unique_id(entry_id, endpoint_id, container_or_stack_name, stack_info, suffix):
     if stack_info.get("is_stack_container") and suffix in {"restart", "pull_update"}:
         stack_name = stack_info.get("stack_name", "unknown")
@@ -19,23 +24,32 @@ def _build_stable_unique_id(entry_id, endpoint_id, container_or_stack_name, stac
         base = f"{stack_name}_{service_name}"
     else:
         base = container_or_stack_name
-    sanitized = base.replace('-', '_').replace(' ', '_').replace('/', '_')
+    # Most container names need no sanitizing, skip building a copy for them
+    sanitized = base if _NEEDS_SANITIZE.isdisjoint(base) else base.translate(_ID_SANITIZE)
     return f"entry_{entry_id}_endpoint_{endpoint_id}_{sanitized}_{suffix}"
 
+# Default Portainer/HTTP(S) ports that are left out of the displayed host name
+_DEFAULT_PORTS = frozenset(("9000", "9443", "80", "443"))
+
 def _get_host_display_name(base_url):
     """Extract a clean host name from the base URL for display purposes."""
     # Remove protocol and common ports
-    host = base_url.replace("https://", "").replace("http://", "")
+    if base_url.startswith("https://"):
+        host = base_url[8:]
+    elif base_url.startswith("http://"):
+        host = base_url[7:]
+    else:
+        host = base_url
     # Remove trailing slash if present
     host = host.rstrip("/")
     # Remove common ports
-    for port in [":9000", ":9443", ":80", ":443"]:
-        if host.endswith(port):
-            host = host[:-len(port)]
+    head, sep, port = host.rpartition(":")
+    if sep and port in _DEFAULT_PORTS:
+        host = head
     
     # If the host is an IP address, keep it as is
     # If it's a domain, try to extract a meaningful name
-    if host.replace('.', '').replace('-', '').replace('_', '').isdigit():
+    if not host.strip("0123456789.-_"):
         # It's an IP address, keep as is
         return host
     else:
@@ -51,6 +65,17 @@ def _get_host_hash(base_url):
     """Generate a short hash of the host URL for unique identification."""
     return hashlib.md5(base_url.encode()).hexdigest()[:8]
 
+def _migrate_unique_id(er_registry, registered, old_uid, new_uid):
+    """Move a registry entry from its old container-ID based unique_id to the stable one."""
+    ent_id = registered.get(old_uid)
+    if not ent_id or old_uid == new_uid:
+        return
+    try:
+        er_registry.async_update_entity(ent_id, new_unique_id=new_uid)
+        _LOGGER.debug("Migrated %s unique_id: %s -> %s", ent_id, old_uid, new_uid)
+    except Exception as e:
+        _LOGGER.debug("Could not migrate %s: %s", ent_id, e)
+
 async def async_setup_entry(hass, entry, async_add_entities):
     conf = entry.data
     host = conf["host"]
@@ -64,39 +89,45 @@ async def async_setup_entry(hass, entry, async_add_entities):
     await api.initialize()
     containers = await api.get_containers(endpoint_id)
 
+    # Inspect all containers concurrently (bounded, like the coordinator's
+    # stats polling) instead of paying one round trip per container in series
+    sem = asyncio.Semaphore(4)
+
+    async def inspect(container_id):
+        async with sem:
+            return await api.inspect_container(endpoint_id, container_id)
+
+    container_infos = await asyncio.gather(*(inspect(container["Id"]) for container in containers))
+
     buttons = []
     added_stacks = set() # To prevent duplicate stack buttons
     
-    # Migrate existing button entities to stable unique_ids
+    # Existing button entities of this entry, keyed by unique_id, so old
+    # container-ID based unique_ids can be migrated without extra lookups
     try:
         er_registry = er.async_get(hass)
-        for container in containers:
-            name = container.get("Names", ["unknown"])[0].strip("/")
-            container_id = container["Id"]
-            container_info = await api.inspect_container(endpoint_id, container_id)
-            stack_info = api.get_container_stack_info(container_info) if container_info else {"is_stack_container": False}
-            for suffix, domain_name in [("restart", "button"), ("pull_update", "button")]:
-                old_uid = f"entry_{entry_id}_endpoint_{endpoint_id}_{container_id}_{suffix}"
-                new_uid = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, suffix)
-                if old_uid != new_uid:
-                    ent_id = er_registry.async_get_entity_id(domain_name, DOMAIN, old_uid)
-                    if ent_id:
-                        try:
-                            er_registry.async_update_entity(ent_id, new_unique_id=new_uid)
-                            _LOGGER.debug("Migrated %s unique_id: %s -> %s", ent_id, old_uid, new_uid)
-                        except Exception as e:
-                            _LOGGER.debug("Could not migrate %s: %s", ent_id, e)
+        registered = {
+            reg_entry.unique_id: reg_entry.entity_id
+            for reg_entry in er.async_entries_for_config_entry(er_registry, entry_id)
+            if reg_entry.domain == "button"
+        }
     except Exception as e:
         _LOGGER.debug("Button registry migration skipped/failed: %s", e)
+        er_registry, registered = None, {}
     
-    for container in containers:
+    for container, container_info in zip(containers, container_infos):
         name = container.get("Names", ["unknown"])[0].strip("/")
         container_id = container["Id"]
         
-        # Get container inspection data to determine if it's part of a stack
-        container_info = await api.inspect_container(endpoint_id, container_id)
+        # Container inspection data determines if it's part of a stack
         stack_info = api.get_container_stack_info(container_info) if container_info else {"is_stack_container": False}
         
+        if registered:
+            for suffix in ("restart", "pull_update"):
+                old_uid = f"entry_{entry_id}_endpoint_{endpoint_id}_{container_id}_{suffix}"
+                new_uid = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, suffix)
+                _migrate_unique_id(er_registry, registered, old_uid, new_uid)
+        
         # Create individual container buttons for all containers - they will all belong to the same stack device if they're in a stack
         buttons.append(RestartContainerButton(name, api, endpoint_id, container_id, stack_info, entry_id))
         buttons.append(PullUpdateButton(name, api, endpoint_id, container_id, stack_info, entry_id))
@@ -110,7 +141,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 buttons.append(StackUpdateButton(stack_name, api, endpoint_id, stack_info, entry_id))
                 added_stacks.add(stack_name)
 
-    async_add_entities(buttons, update_before_add=True)
+    async_add_entities(buttons)
 
 class RestartContainerButton(ButtonEntity):
     """Button to restart a Docker container."""
@@ -182,7 +213,7 @@ class RestartContainerButton(ButtonEntity):
             # For stack containers, use the stack as the device
             stack_name = self._stack_info.get("stack_name", "unknown_stack")
             # Use a more robust identifier that includes the entry_id, host hash, and host name to prevent duplicates
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"Stack: {stack_name} ({host_name})",
@@ -192,7 +223,7 @@ class RestartContainerButton(ButtonEntity):
             }
         else:
             # For standalone containers, use the container as the device
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"{self._container_name} ({host_name})",
@@ -244,7 +275,7 @@ class PullUpdateButton(ButtonEntity):
             # For stack containers, use the stack as the device
             stack_name = self._stack_info.get("stack_name", "unknown_stack")
             # Use a more robust identifier that includes the entry_id, host hash, and host name to prevent duplicates
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"Stack: {stack_name} ({host_name})",
@@ -254,7 +285,7 @@ class PullUpdateButton(ButtonEntity):
             }
         else:
             # For standalone containers, use the container as the device
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"{self._container_name} ({host_name})",
@@ -501,7 +532,7 @@ class StackStopButton(ButtonEntity):
             # For stack containers, use the stack as the device
             stack_name = self._stack_info.get("stack_name", "unknown_stack")
             # Use a more robust identifier that includes the entry_id, host hash, and host name to prevent duplicates
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"Stack: {stack_name} ({host_name})",
@@ -511,7 +542,7 @@ class StackStopButton(ButtonEntity):
             }
         else:
             # For standalone containers, use the container as the device
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"{self._stack_name} ({host_name})",
@@ -609,7 +640,7 @@ class StackStartButton(ButtonEntity):
             # For stack containers, use the stack as the device
             stack_name = self._stack_info.get("stack_name", "unknown_stack")
             # Use a more robust identifier that includes the entry_id, host hash, and host name to prevent duplicates
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"Stack: {stack_name} ({host_name})",
@@ -619,7 +650,7 @@ class StackStartButton(ButtonEntity):
             }
         else:
             # For standalone containers, use the container as the device
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
             return {
                 "identifiers": {(DOMAIN, device_id)},
                 "name": f"{self._stack_name} ({host_name})",
@@ -712,7 +743,7 @@ class StackUpdateButton(ButtonEntity):
         host_name = _get_host_display_name(self._api.base_url)
         host_hash = _get_host_hash(self._api.base_url)
         stack_name = self._stack_info.get("stack_name", self._stack_name)
-        device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
+        device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
         return {
             "identifiers": {(DOMAIN, device_id)},
             "name": f"Stack: {stack_name} ({host_name})",
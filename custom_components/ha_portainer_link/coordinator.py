@@ -1,6 +1,7 @@
 import logging
-from datetime import timedelta
-from typing import Dict, List, Optional, Any
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.core import HomeAssistant
 import asyncio
@@ -9,6 +10,17 @@ from .portainer_api import PortainerAPI
 
 _LOGGER = logging.getLogger(__name__)
 
+def _format_uptime(uptime_s: int) -> str:
+    """Turn an uptime in seconds into the text shown by the uptime sensor."""
+    if uptime_s > 86400:
+        return f"{uptime_s // 86400} days ago"
+    elif uptime_s > 3600:
+        return f"{uptime_s // 3600} hours ago"
+    elif uptime_s > 60:
+        return f"{uptime_s // 60} minutes ago"
+    else:
+        return "Just started"
+
 class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinator for Portainer data updates."""
 
@@ -22,6 +34,9 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=f"portainer_data_{endpoint_id}",
             update_interval=timedelta(minutes=update_interval),
+            # Skip notifying listeners when the payload compares equal to the
+            # previous one; it only holds values the entities actually display
+            always_update=False,
         )
         self.api = api
         self.endpoint_id = endpoint_id
@@ -32,8 +47,9 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
         self.container_stack_info: Dict[str, Dict[str, Any]] = {}  # container_id -> detailed stack info
         self.update_availability: Dict[str, bool] = {}  # container_id -> has_updates
         self.stable_container_map: Dict[str, str] = {}  # stable_id -> container_id
-        self.metrics: Dict[str, Dict[str, Any]] = {}  # container_id -> {cpu_percent, memory_mb, uptime_s}
+        self.metrics: Dict[str, Dict[str, Any]] = {}  # container_id -> {cpu_percent, memory_mb, uptime_display}
         self.image_data: Dict[str, Dict[str, Any]] = {}  # container_id -> image metadata
+        self._started_at_cache: Dict[str, Tuple[str, float]] = {}  # container_id -> (StartedAt, epoch seconds)
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Update container and stack data."""
@@ -49,11 +65,7 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
                     _LOGGER.error("❌ Available endpoints are: %s", [ep.get("Id") for ep in available_endpoints])
                 else:
                     _LOGGER.error("❌ No endpoints found. Check your Portainer configuration.")
-                return {
-                    "containers": [],
-                    "stacks": [],
-                    "container_stack_map": {}
-                }
+                return self._empty_dataset()
             
             # Get containers and stacks in parallel
             containers_task = self.api.get_containers(self.endpoint_id)
@@ -68,11 +80,7 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
             # Defensive handling when API returns None (e.g., 403/404)
             if containers is None:
                 _LOGGER.error("❌ Containers list is None; returning empty dataset to keep HA responsive")
-                return {
-                    "containers": {},
-                    "stacks": {},
-                    "container_stack_map": {}
-                }
+                return self._empty_dataset()
             
             # Process containers
             self.containers = {}
@@ -197,10 +205,15 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
                                 info = await self.api.inspect_container(self.endpoint_id, container_id)
                                 started_at = (info or {}).get("State", {}).get("StartedAt")
                                 if started_at:
-                                    import datetime
-                                    start_time = datetime.datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-                                    current_time = datetime.datetime.now(datetime.timezone.utc)
-                                    metrics["uptime_s"] = int((current_time - start_time).total_seconds())
+                                    # StartedAt only changes on restart, parse it once per value
+                                    cached = self._started_at_cache.get(container_id)
+                                    if cached is None or cached[0] != started_at:
+                                        start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+                                        cached = (started_at, start_time.timestamp())
+                                        self._started_at_cache[container_id] = cached
+                                    # Only the bucketed text is kept: a raw seconds count would
+                                    # differ on every tick and defeat always_update=False
+                                    metrics["uptime_display"] = _format_uptime(int(time.time() - cached[1]))
                         except Exception as e:
                             _LOGGER.debug("⚠️ Failed to compute uptime for %s: %s", container_id, e)
                         
@@ -209,6 +222,10 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
                 
                 await asyncio.gather(*(compute_metrics(cid, cdata) for cid, cdata in self.containers.items()))
 
+                # Forget start times of containers that are gone
+                for container_id in self._started_at_cache.keys() - self.containers.keys():
+                    del self._started_at_cache[container_id]
+
             
             _LOGGER.info("✅ Updated Portainer data: %d containers (%d stack, %d standalone), %d stacks", 
                         len(self.containers), stack_containers_count, standalone_containers_count, len(self.stacks))
@@ -216,15 +233,33 @@ class PortainerDataUpdateCoordinator(DataUpdateCoordinator):
             return {
                 "containers": self.containers,
                 "stacks": self.stacks,
-                "container_stack_map": self.container_stack_map
+                "container_stack_map": self.container_stack_map,
+                # Metrics are part of the payload so that always_update=False
+                # still notifies listeners when only CPU/memory/uptime text changed
+                "metrics": self.metrics,
             }
             
         except Exception as e:
             _LOGGER.exception("❌ Error updating Portainer data: %s", e)
             raise UpdateFailed(f"Failed to update Portainer data: {e}")
 
+    def _empty_dataset(self) -> Dict[str, Any]:
+        """Clear cached data and return an empty payload with the usual shape."""
+        self.containers = {}
+        self.stacks = {}
+        self.container_stack_map = {}
+        self.container_stack_info = {}
+        self.stable_container_map = {}
+        self.metrics = {}
+        return {
+            "containers": self.containers,
+            "stacks": self.stacks,
+            "container_stack_map": self.container_stack_map,
+            "metrics": self.metrics,
+        }
+
     def get_container(self, container_id: str) -> Optional[Dict[str, Any]]:
-        """Get container data by ID."""
+        """Get container data by ID (containers are always kept as a dict keyed by ID)."""
         return self.containers.get(container_id)
 
     def get_stack(self, stack_name: str) -> Optional[Dict[str, Any]]:
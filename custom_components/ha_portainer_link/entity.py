@@ -11,20 +11,31 @@ from . import create_portainer_device_info, create_stack_device_info, create_con
 
 _LOGGER = logging.getLogger(__name__)
 
+# Single-pass replacement table for identifier sanitization
+_ID_SANITIZE = str.maketrans({'-': '_', ' ': '_', '/': '_'})
+
+# Default Portainer/HTTP(S) ports that are left out of the displayed host name
+_DEFAULT_PORTS = frozenset(("9000", "9443", "80", "443"))
+
 def _get_host_display_name(base_url: str) -> str:
     """Extract a clean host name from the base URL for display purposes."""
     # Remove protocol and common ports
-    host = base_url.replace("https://", "").replace("http://", "")
+    if base_url.startswith("https://"):
+        host = base_url[8:]
+    elif base_url.startswith("http://"):
+        host = base_url[7:]
+    else:
+        host = base_url
     # Remove trailing slash if present
     host = host.rstrip("/")
     # Remove common ports
-    for port in [":9000", ":9443", ":80", ":443"]:
-        if host.endswith(port):
-            host = host[:-len(port)]
+    head, sep, port = host.rpartition(":")
+    if sep and port in _DEFAULT_PORTS:
+        host = head
     
     # If the host is an IP address, keep it as is
     # If it's a domain, try to extract a meaningful name
-    if host.replace('.', '').replace('-', '').replace('_', '').isdigit():
+    if not host.strip("0123456789.-_"):
         # It's an IP address, keep as is
         return host
     else:
@@ -56,7 +67,7 @@ def _get_stable_entity_id(entry_id: str, endpoint_id: int, container_name: str,
         stable_id = container_name
     
     # Sanitize the stable ID
-    sanitized_id = stable_id.replace('-', '_').replace(' ', '_').replace('/', '_')
+    sanitized_id = stable_id.translate(_ID_SANITIZE)
     return f"entry_{entry_id}_endpoint_{endpoint_id}_{sanitized_id}_{entity_type}"
 
 def _get_container_stable_id(container_name: str, stack_info: Dict[str, Any]) -> str:
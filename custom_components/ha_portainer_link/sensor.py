@@ -1,43 +1,107 @@
 import logging
 import hashlib
+from functools import lru_cache
+from types import MappingProxyType
 
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import callback
 
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
-def _build_stable_unique_id(entry_id, endpoint_id, container_name, stack_info, suffix):
+# Single-pass replacement tables for identifier sanitization
+_ID_SANITIZE = str.maketrans({'-': '_', ' ': '_', '/': '_'})
+_NEEDS_SANITIZE = frozenset("- /")
+_HOST_SANITIZE = str.maketrans({'.': '_', ':': '_'})
+
+_STATUS_ICONS = {
+    "running": "mdi:docker",
+    "exited": "mdi:close-circle",
+    "paused": "mdi:pause-circle",
+}
+_UNKNOWN_ICON = "mdi:help-circle"
+
+# Shared read-only fallback, avoids allocating an empty dict per lookup
+_EMPTY = MappingProxyType({})
+
+_MANUFACTURER = "Docker via Portainer"
+_MODEL_STACK = "Docker Stack"
+_MODEL_CONTAINER = "Docker Container"
+
+# unique_id suffixes, one per sensor type
+_SUFFIX_STATUS = "status"
+_SUFFIX_CPU = "cpu_usage"
+_SUFFIX_MEMORY = "memory_usage"
+_SUFFIX_UPTIME = "uptime"
+_SUFFIX_IMAGE = "image"
+
+def _get_container_stable_id(container_name, stack_info):
+    """Same key as the coordinator's stable_container_map, survives container recreation."""
     if stack_info.get("is_stack_container"):
         stack_name = stack_info.get("stack_name", "unknown")
         service_name = stack_info.get("service_name", container_name)
-        base = f"{stack_name}_{service_name}"
-    else:
-        base = container_name
-    
-    sanitized = base.replace('-', '_').replace(' ', '_').replace('/', '_')
-    return f"entry_{entry_id}_endpoint_{endpoint_id}_{sanitized}_{suffix}"
+        return f"{stack_name}_{service_name}"
+    return container_name
+
+def _build_unique_id_prefix(entry_id, endpoint_id, container_name, stack_info):
+    base = _get_container_stable_id(container_name, stack_info)
+    # Most container names need no sanitizing, skip building a copy for them
+    sanitized = base if _NEEDS_SANITIZE.isdisjoint(base) else base.translate(_ID_SANITIZE)
+    return f"entry_{entry_id}_endpoint_{endpoint_id}_{sanitized}_"
+
+# Default Portainer/HTTP(S) ports that are left out of the displayed host name
+_DEFAULT_PORTS = frozenset(("9000", "9443", "80", "443"))
 
+@lru_cache(maxsize=32)
 def _get_host_display_name(base_url):
-    host = base_url.replace("https://", "http://").replace("http://", "")
+    if base_url.startswith("https://"):
+        host = base_url[8:]
+    elif base_url.startswith("http://"):
+        host = base_url[7:]
+    else:
+        host = base_url
     host = host.rstrip("/")
-    for port in [":9000", ":9443", ":80", ":443"]:
-        if host.endswith(port):
-            host = host[:-len(port)]
+    head, sep, port = host.rpartition(":")
+    if sep and port in _DEFAULT_PORTS:
+        host = head
     
-    if host.replace('.', '').replace('-', '').replace('_', '').isdigit():
+    # IP addresses are kept as is, domains are reduced to their first label
+    if not host.strip("0123456789.-_"):
         return host
-    else:
-        parts = host.split('.')
-        if len(parts) >= 2:
-            return parts[0]
-        else:
-            return host
+    return host.partition(".")[0]
 
+@lru_cache(maxsize=32)
 def _get_host_hash(base_url):
-    return hashlib.md5(base_url.encode()).hexdigest()[:8]
+    # Only the first 4 digest bytes are kept: same value as hexdigest()[:8],
+    # which keeps device identifiers shared with the other platforms stable
+    return hashlib.md5(base_url.encode(), usedforsecurity=False).digest()[:4].hex()
+
+def _build_device_info(api_url, entry_id, endpoint_id, container_id, container_name, stack_info):
+    host_name = _get_host_display_name(api_url)
+    host_hash = _get_host_hash(api_url)
+    
+    if stack_info.get("is_stack_container"):
+        stack_name = stack_info.get("stack_name", "unknown_stack")
+        device_id = f"entry_{entry_id}_endpoint_{endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
+        return {
+            "identifiers": {(DOMAIN, device_id)},
+            "name": f"Stack: {stack_name} ({host_name})",
+            "manufacturer": _MANUFACTURER,
+            "model": _MODEL_STACK,
+            "configuration_url": f"{api_url}/#!/stacks/{stack_name}",
+        }
+    else:
+        device_id = f"entry_{entry_id}_endpoint_{endpoint_id}_container_{container_id}_{host_hash}_{host_name.translate(_HOST_SANITIZE)}"
+        return {
+            "identifiers": {(DOMAIN, device_id)},
+            "name": f"{container_name} ({host_name})",
+            "manufacturer": _MANUFACTURER,
+            "model": _MODEL_CONTAINER,
+            "configuration_url": f"{api_url}/#!/containers/{container_id}/details",
+        }
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Portainer sensors using the coordinator."""
@@ -54,6 +118,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
     containers = coordinator.data.get("containers", {})
     _LOGGER.info("📦 Sensor setup: Found %d containers in coordinator data", len(containers))
 
+    api_url = coordinator.api.base_url
+    stack_device_infos = {}
     entities = []
     
     # Pour chaque conteneur trouvé dans le coordinateur
@@ -64,12 +130,24 @@ async def async_setup_entry(hass, entry, async_add_entities):
         # (plus besoin de refaire un appel API inspect_container ici !)
         stack_info = coordinator.container_stack_info.get(container_id, {"is_stack_container": False})
 
+        # Identifiants et device calculés une seule fois pour les 5 capteurs
+        prefix = _build_unique_id_prefix(entry_id, endpoint_id, name, stack_info)
+        if stack_info.get("is_stack_container"):
+            stack_name = stack_info.get("stack_name", "unknown_stack")
+            device_info = stack_device_infos.get(stack_name)
+            if device_info is None:
+                device_info = _build_device_info(api_url, entry_id, endpoint_id, container_id, name, stack_info)
+                stack_device_infos[stack_name] = device_info
+        else:
+            device_info = _build_device_info(api_url, entry_id, endpoint_id, container_id, name, stack_info)
+
         # Création des entités liées au coordinateur
-        entities.append(ContainerStatusSensor(coordinator, name, endpoint_id, container_id, stack_info, entry_id))
-        entities.append(ContainerCPUSensor(coordinator, name, endpoint_id, container_id, stack_info, entry_id))
-        entities.append(ContainerMemorySensor(coordinator, name, endpoint_id, container_id, stack_info, entry_id))
-        entities.append(ContainerUptimeSensor(coordinator, name, endpoint_id, container_id, stack_info, entry_id))
-        entities.append(ContainerImageSensor(coordinator, name, endpoint_id, container_id, stack_info, entry_id))
+        args = (coordinator, name, endpoint_id, container_id, stack_info, entry_id, prefix, device_info)
+        entities.append(ContainerStatusSensor(*args))
+        entities.append(ContainerCPUSensor(*args))
+        entities.append(ContainerMemorySensor(*args))
+        entities.append(ContainerUptimeSensor(*args))
+        entities.append(ContainerImageSensor(*args))
 
     async_add_entities(entities)
 
@@ -77,134 +155,138 @@ async def async_setup_entry(hass, entry, async_add_entities):
 class BaseContainerSensor(CoordinatorEntity, SensorEntity):
     """Base class for all container sensors that follows the coordinator."""
     
-    def __init__(self, coordinator, container_name, endpoint_id, container_id, stack_info, entry_id):
+    # The HA base classes still carry a __dict__ (needed for their cached
+    # _attr_* properties), so only our own fields are slotted here
+    __slots__ = (
+        "_container_name",
+        "_container_id",
+        "_endpoint_id",
+        "_stack_info",
+        "_entry_id",
+        "_stable_id",
+        "_last_state",
+        "_container",
+        "_metrics",
+    )
+
+    # Set by each sensor type
+    _name_suffix = None
+    _unique_id_suffix = None
+
+    def __init__(self, coordinator, container_name, endpoint_id, container_id, stack_info, entry_id, unique_id_prefix, device_info):
         super().__init__(coordinator)
         self._container_name = container_name
         self._container_id = container_id
         self._endpoint_id = endpoint_id
         self._stack_info = stack_info
         self._entry_id = entry_id
-        self._api_url = coordinator.api.base_url
+        self._stable_id = _get_container_stable_id(container_name, stack_info)
+        self._attr_name = f"{container_name} {self._name_suffix}"
+        self._attr_unique_id = unique_id_prefix + self._unique_id_suffix
+        self._last_state = None
+        # Built once in async_setup_entry and shared by all sensors of the container
+        self._attr_device_info = device_info
+        self._refresh_from_coordinator()
+
+    def _rebind_container(self):
+        """Follow a recreated container using the map the coordinator built this tick."""
+        new_id = self.coordinator.get_container_by_stable_id(self._stable_id)
+        if not new_id or new_id == self._container_id:
+            return None
+        _LOGGER.debug("🔄 Rebinding %s: %s -> %s", self._container_name, self._container_id[:12], new_id[:12])
+        self._container_id = new_id
+        return self.coordinator.get_container(new_id)
+
+    def _refresh_from_coordinator(self) -> None:
+        """Derive per-tick values once instead of on every property read."""
+        container = self.coordinator.get_container(self._container_id)
+        if container is None:
+            container = self._rebind_container()
+        self._container = container if container is not None else _EMPTY
+        self._metrics = self.coordinator.metrics.get(self._container_id) or _EMPTY
+        self._attr_available = self.coordinator.last_update_success and container is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value shown to the user changed."""
+        self._refresh_from_coordinator()
+        # Like Home Assistant itself, never read the value of an unavailable entity
+        available = self.available
+        state = (available, self.native_value if available else None)
+        if state == self._last_state:
+            return
+        self._last_state = state
+        self.async_write_ha_state()
 
-    @property
-    def device_info(self):
-        host_name = _get_host_display_name(self._api_url)
-        host_hash = _get_host_hash(self._api_url)
-        
-        if self._stack_info.get("is_stack_container"):
-            stack_name = self._stack_info.get("stack_name", "unknown_stack")
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_stack_{stack_name}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
-            return {
-                "identifiers": {(DOMAIN, device_id)},
-                "name": f"Stack: {stack_name} ({host_name})",
-                "manufacturer": "Docker via Portainer",
-                "model": "Docker Stack",
-                "configuration_url": f"{self._api_url}/#!/stacks/{stack_name}",
-            }
-        else:
-            device_id = f"entry_{self._entry_id}_endpoint_{self._endpoint_id}_container_{self._container_id}_{host_hash}_{host_name.replace('.', '_').replace(':', '_')}"
-            return {
-                "identifiers": {(DOMAIN, device_id)},
-                "name": f"{self._container_name} ({host_name})",
-                "manufacturer": "Docker via Portainer",
-                "model": "Docker Container",
-                "configuration_url": f"{self._api_url}/#!/containers/{self._container_id}/details",
-            }
-            
     @property
     def available(self) -> bool:
         """Entity is available if coordinator is successful and container is in the list."""
-        return (
-            super().available 
-            and "containers" in self.coordinator.data 
-            and self._container_id in self.coordinator.data["containers"]
-        )
+        # CoordinatorEntity.available ignores _attr_available, so expose it explicitly
+        return self._attr_available
 
 class ContainerStatusSensor(BaseContainerSensor):
-    def __init__(self, coordinator, name, endpoint_id, container_id, stack_info, entry_id):
-        super().__init__(coordinator, name, endpoint_id, container_id, stack_info, entry_id)
-        self._attr_name = f"{name} Status"
-        self._attr_unique_id = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "status")
+    __slots__ = ()
+
+    _name_suffix = "Status"
+    _unique_id_suffix = _SUFFIX_STATUS
 
     @property
     def native_value(self):
-        container = self.coordinator.data["containers"].get(self._container_id, {})
         # Gestion robuste des formats d'état (dict ou str)
-        state_obj = container.get("State", {})
+        state_obj = self._container.get("State", _EMPTY)
         if isinstance(state_obj, dict):
             return state_obj.get("Status", STATE_UNKNOWN)
         return STATE_UNKNOWN
 
     @property
     def icon(self):
-        val = self.native_value
-        return {
-            "running": "mdi:docker",
-            "exited": "mdi:close-circle",
-            "paused": "mdi:pause-circle",
-        }.get(val, "mdi:help-circle")
+        return _STATUS_ICONS.get(self.native_value, _UNKNOWN_ICON)
 
 class ContainerCPUSensor(BaseContainerSensor):
-    def __init__(self, coordinator, name, endpoint_id, container_id, stack_info, entry_id):
-        super().__init__(coordinator, name, endpoint_id, container_id, stack_info, entry_id)
-        self._attr_name = f"{name} CPU Usage"
-        self._attr_unique_id = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "cpu_usage")
-        self._attr_native_unit_of_measurement = "%"
-        self._attr_icon = "mdi:cpu-64-bit"
+    __slots__ = ()
+
+    _name_suffix = "CPU Usage"
+    _unique_id_suffix = _SUFFIX_CPU
+    _attr_native_unit_of_measurement = "%"
+    _attr_icon = "mdi:cpu-64-bit"
 
     @property
     def native_value(self):
         # Lecture directe depuis les métriques calculées par le coordinateur
-        metrics = self.coordinator.metrics.get(self._container_id, {})
-        return metrics.get("cpu_percent", STATE_UNKNOWN)
+        return self._metrics.get("cpu_percent", STATE_UNKNOWN)
 
 class ContainerMemorySensor(BaseContainerSensor):
-    def __init__(self, coordinator, name, endpoint_id, container_id, stack_info, entry_id):
-        super().__init__(coordinator, name, endpoint_id, container_id, stack_info, entry_id)
-        self._attr_name = f"{name} Memory Usage"
-        self._attr_unique_id = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "memory_usage")
-        self._attr_native_unit_of_measurement = "MB"
-        self._attr_icon = "mdi:memory"
+    __slots__ = ()
+
+    _name_suffix = "Memory Usage"
+    _unique_id_suffix = _SUFFIX_MEMORY
+    _attr_native_unit_of_measurement = "MB"
+    _attr_icon = "mdi:memory"
 
     @property
     def native_value(self):
-        metrics = self.coordinator.metrics.get(self._container_id, {})
-        return metrics.get("memory_mb", STATE_UNKNOWN)
+        return self._metrics.get("memory_mb", STATE_UNKNOWN)
 
 class ContainerUptimeSensor(BaseContainerSensor):
-    def __init__(self, coordinator, name, endpoint_id, container_id, stack_info, entry_id):
-        super().__init__(coordinator, name, endpoint_id, container_id, stack_info, entry_id)
-        self._attr_name = f"{name} Uptime"
-        self._attr_unique_id = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "uptime")
-        self._attr_icon = "mdi:clock-outline"
+    __slots__ = ()
+
+    _name_suffix = "Uptime"
+    _unique_id_suffix = _SUFFIX_UPTIME
+    _attr_icon = "mdi:clock-outline"
 
     @property
     def native_value(self):
-        metrics = self.coordinator.metrics.get(self._container_id, {})
-        uptime_s = metrics.get("uptime_s")
-        
-        if uptime_s is None:
-            return "Not started"
-            
-        # Conversion simple en texte lisible
-        if uptime_s > 86400:
-            return f"{uptime_s // 86400} days ago"
-        elif uptime_s > 3600:
-            return f"{uptime_s // 3600} hours ago"
-        elif uptime_s > 60:
-            return f"{uptime_s // 60} minutes ago"
-        else:
-            return "Just started"
+        # Texte calculé une fois par tick par le coordinateur
+        return self._metrics.get("uptime_display", "Not started")
 
 class ContainerImageSensor(BaseContainerSensor):
-    def __init__(self, coordinator, name, endpoint_id, container_id, stack_info, entry_id):
-        super().__init__(coordinator, name, endpoint_id, container_id, stack_info, entry_id)
-        self._attr_name = f"{name} Image"
-        self._attr_unique_id = _build_stable_unique_id(entry_id, endpoint_id, name, stack_info, "image")
-        self._attr_icon = "mdi:docker"
+    __slots__ = ()
+
+    _name_suffix = "Image"
+    _unique_id_suffix = _SUFFIX_IMAGE
+    _attr_icon = "mdi:docker"
 
     @property
     def native_value(self):
-        container = self.coordinator.data["containers"].get(self._container_id, {})
         # On préfère l'info de config si dispo, sinon l'image ID brute
-        return container.get("Image", STATE_UNKNOWN)
+        return self._container.get("Image", STATE_UNKNOWN)